@@ -0,0 +1,179 @@
+'''
+benchmarks convert_models_to_resources() against synthetic model configs.
+
+each size runs in its own child process (so peak RSS is per size) inside a fresh temp dir,
+and the results are printed (or written with --output) as JSON so they can be compared across commits:
+
+  python benchmark.py --sizes 10 100 1000 --output bench.json
+'''
+
+import os, sys, json, time, random, argparse, tempfile, subprocess, resource
+
+
+
+default_sizes = [10, 100, 1000, 5000]
+
+field_data_types = ['string', 'text', 'integer', 'float', 'boolean', 'date', 'datetime', 'jsonb']
+
+relationship_types = ['hasOne', 'hasMany', 'belongsToOne', 'belongsToMany']
+
+
+
+def make_field_config(data_type: str, rng: random.Random) -> dict:
+  field_config = { "dataType": data_type, "required": rng.random() < 0.3 }
+  if data_type == 'string' and rng.random() < 0.5:
+    field_config["maxLength"] = rng.choice([50, 255, 500])
+  if data_type in ['integer', 'float'] and rng.random() < 0.2:
+    field_config["defaultValue"] = 0
+  if data_type == 'boolean':
+    field_config["defaultValue"] = False
+  return field_config
+
+
+def make_synthetic_config(model_count: int, seed: int = 1, min_fields: int = 4, max_fields: int = 30, relationship_density: float = 1.5) -> dict:
+  '''
+  builds a models.json-shaped config of `model_count` models with between `min_fields` and `max_fields`
+  extra fields each, and on average `relationship_density` relationships per model spread over
+  hasOne/hasMany/belongsToOne/belongsToMany (some hasMany/belongsToMany go through a third model).
+  every model gets `id`, `parent_id` and `ref_id` so any model can be related to any other.
+  '''
+  rng = random.Random(seed)
+  model_names = [f"Model{index}" for index in range(model_count)]
+
+  models = {}
+  for model_name in model_names:
+    fields = {
+      "id": { "dataType": "integer", "required": True, "primaryKey": True },
+      "parent_id": { "dataType": "integer", "required": False },
+      "ref_id": { "dataType": "integer", "required": False },
+      "create_at": { "dataType": "datetime", "required": True, "defaultValue": "now" },
+    }
+    for index in range(rng.randint(min_fields, max_fields)):
+      data_type = rng.choice(field_data_types)
+      fields[f"{data_type}_field_{index}"] = make_field_config(data_type, rng)
+
+    model_config = { "tableName": model_name.lower(), "fields": fields }
+    if rng.random() < 0.3:
+      model_config["indexes"] = [{ "fields": ["parent_id", "ref_id"], "unique": rng.random() < 0.5 }]
+    models[model_name] = model_config
+
+  relationships = {}
+  if model_count > 1:
+    for index in range(int(model_count * relationship_density)):
+      model_name = rng.choice(model_names)
+      relation_model = rng.choice(model_names)
+      if relation_model == model_name:
+        continue
+      relationship_type = rng.choice(relationship_types)
+      model_relationships = relationships.setdefault(model_name, {}).setdefault(relationship_type, {})
+      if relation_model in model_relationships:
+        continue
+
+      alias = f"{relationship_type}{relation_model}"
+      through_model = rng.choice(model_names) if (model_count > 2 and rng.random() < 0.2) else None
+      if through_model in [model_name, relation_model]:
+        through_model = None
+
+      if relationship_type == 'hasOne':
+        relationship = { "alias": alias, "foreignKey": "id", "sourceKey": "ref_id" }
+      elif relationship_type == 'hasMany':
+        relationship = { "alias": alias, "foreignKey": "parent_id", "sourceKey": "id" }
+      else:
+        relationship = { "alias": alias, "foreignKey": "parent_id", "targetKey": "id" }
+
+      if through_model and relationship_type in ['hasMany', 'belongsToMany']:
+        relationship["through"] = through_model
+
+      model_relationships[relation_model] = relationship
+
+  return { "models": models, "relationships": relationships }
+
+
+def run_one(model_count: int, seed: int, jobs: int) -> dict:
+  '''
+  runs in the child process: writes the synthetic config into a fresh temp dir and generates into it
+  '''
+  sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+  import models_to_resources
+
+  config = make_synthetic_config(model_count, seed = seed)
+  field_count = sum(len(model_config["fields"]) for model_config in config["models"].values())
+  relationship_count = sum(
+    len(models)
+    for model_relationships in config["relationships"].values()
+    for models in model_relationships.values()
+  )
+
+  with tempfile.TemporaryDirectory(prefix = "models-to-resources-bench-") as temp_dir:
+    os.chdir(temp_dir)
+    os.makedirs("app", exist_ok = True)
+    with open("models.json", "w") as f:
+      json.dump(config, f)
+
+    timer = models_to_resources.StageTimer()
+    started = time.perf_counter()
+    stats = models_to_resources.convert_models_to_resources(force = True, jobs = jobs, models_path = "models.json", timer = timer)
+    wall_time = time.perf_counter() - started
+
+  # ru_maxrss is KiB on linux, bytes on macOS
+  rss_unit = 1 if sys.platform == 'darwin' else 1024
+
+  return {
+    "models": model_count,
+    "fields": field_count,
+    "relationships": relationship_count,
+    "jobs": jobs,
+    "wall_time_s": round(wall_time, 4),
+    "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * rss_unit,
+    "peak_worker_rss_bytes": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * rss_unit,
+    "files_written": stats["written"],
+    "bytes_written": stats["bytes_written"],
+    "stages_s": { stage: round(seconds, 4) for stage, seconds in sorted(timer.timings.items(), key = lambda item: -item[1]) },
+  }
+
+
+def run_benchmarks(sizes: list[int], seed: int = 1, jobs: int = 1) -> dict:
+  results = []
+  for model_count in sizes:
+    child = subprocess.run(
+      [sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--run-one', str(model_count), '--seed', str(seed), '--jobs', str(jobs)],
+      capture_output = True,
+      text = True,
+      check = True,
+    )
+    # the generator prints progress; the result is the last line
+    result = json.loads(child.stdout.strip().splitlines()[-1])
+    print(f"{model_count} models: {result['wall_time_s']}s, {result['bytes_written']} bytes, peak RSS {result['peak_rss_bytes'] // (1024 * 1024)} MiB", file = sys.stderr)
+    results.append(result)
+
+  return {
+    "python": sys.version.split()[0],
+    "seed": seed,
+    "results": results,
+  }
+
+
+def run():
+  parser = argparse.ArgumentParser(description = "benchmark the generator against synthetic model configs")
+  parser.add_argument("--sizes", type = int, nargs = "+", default = default_sizes, help = "model counts to benchmark")
+  parser.add_argument("--seed", type = int, default = 1, help = "seed for the synthetic configs")
+  parser.add_argument("--jobs", "-j", type = int, default = 1, help = "passed through to the generator")
+  parser.add_argument("--output", "-o", help = "write the JSON report to this file instead of stdout")
+  parser.add_argument("--run-one", type = int, help = argparse.SUPPRESS)
+  args = parser.parse_args()
+
+  if args.run_one is not None:
+    print(json.dumps(run_one(args.run_one, args.seed, args.jobs)))
+    return
+
+  report = json.dumps(run_benchmarks(args.sizes, seed = args.seed, jobs = args.jobs), indent = 2)
+  if args.output:
+    with open(args.output, 'w') as f:
+      f.write(report + '\n')
+  else:
+    print(report)
+
+
+
+if __name__ == '__main__':
+  run()